@@ -17,4 +17,10 @@ def parse_args():
     parser.add_argument("--username", required=True, help="Confluence username/email")
     parser.add_argument("--token", required=True, help="Confluence API token")
     parser.add_argument("--output-dir", default="output", help="Output directory")
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Number of pages fetched and converted concurrently",
+    )
     return parser.parse_args()
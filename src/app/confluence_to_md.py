@@ -8,7 +8,9 @@ image URLs into download URLs so that images are downloaded properly.
 Usage:
 """
 
+import logging
 import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from src.app.config import parse_args
 from src.util.confluence_client import ConfluenceClient
@@ -22,22 +24,23 @@ setup_logging()
 logger = Logger(__name__, level=20, colored=False)
 
 
-def process_page(client, writer, converter, page_id, parent_dir, is_root=False):
+def process_page(
+    client, writer, converter, page_id, parent_dir, is_root=False, downloads=None
+):
     """
-    Process a Confluence page: fetch content, write raw HTML for debugging,
-    convert to Markdown, update inline image references, save the file, download
-    images, and process child pages recursively.
+    Process a Confluence page: fetch content, convert to Markdown, save the
+    file and download images. Returns the (page_id, output_dir) pairs of the child pages
+    still to be processed.
     """
     try:
-        page = client.get_page(page_id)
+        page, children, images = client.get_page_full(page_id)
     except Exception as exc:
         logger.error(
             "Error retrieving page %s: %s", page_id, exc, extra={"caller": __name__}
         )
-        return
+        return []
 
     title = page.get("title", f"page_{page_id}")
-    children = client.get_children(page_id)
     safe_title = sanitize_title(title)
     if is_root:
         output_dir = parent_dir
@@ -49,32 +52,82 @@ def process_page(client, writer, converter, page_id, parent_dir, is_root=False):
         else:
             output_dir = parent_dir
             file_name = f"{safe_title}.md"
-    os.makedirs(output_dir, exist_ok=True)
+    writer.ensure_dir(output_dir)
 
     html_content = page["body"]["storage"]["value"]
-    logger.debug("HTML snippet (first 500 chars): %s", html_content[:500])
+    debug = logger.isEnabledFor(logging.DEBUG)
+    if debug:
+        logger.debug("HTML snippet (first 500 chars): %s", html_content[:500])
 
     markdown_content = converter.convert(html_content)
-    logger.debug("Markdown snippet (first 500 chars): %s", markdown_content[:500])
+    if debug:
+        logger.debug("Markdown snippet (first 500 chars): %s", markdown_content[:500])
     content = f"# {title}\n\n{markdown_content}"
     writer.save_markdown_file(os.path.join(output_dir, file_name), content)
 
-    images = client.get_images(page_id)
-    for img in images:
+    save_images(client, writer, images, output_dir, downloads=downloads)
+    return [(child.id, output_dir) for child in children]
+
+
+def save_images(client, writer, images, output_dir, downloads=None):
+    """
+    Download a page's images into output_dir, concurrently when a downloads
+    executor is given. Failures are logged per image so one bad attachment
+    does not abort the rest.
+    """
+
+    def save(img):
         try:
-            sanitized_name = sanitize_title(img["filename"])
+            sanitized_name = sanitize_title(img.filename)
             writer.save_image(
-                output_dir, sanitized_name, img["url"], session=client.session
+                output_dir, sanitized_name, img.url, session=client.session
             )
         except Exception as exc:
             logger.error(
                 "Error saving image %s: %s",
-                img["filename"],
+                img.filename,
                 exc,
                 extra={"caller": __name__},
             )
-    for child in children:
-        process_page(client, writer, converter, child["id"], output_dir, is_root=False)
+
+    mapper = downloads.map if downloads is not None else map
+    list(mapper(save, images))
+
+
+def process_all(client, writer, converter, root_id, root_dir, max_workers=8):
+    """
+    Process the page tree rooted at root_id without recursion. An explicit
+    set of pending pages replaces the call stack: each page is submitted to a
+    thread pool sharing the client's session as soon as its parent has been
+    written, so deep trees cannot hit the recursion limit and fast branches
+    never wait on slow ones. Image downloads run on a second pool of the same
+    size.
+    """
+    with (
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+        ThreadPoolExecutor(max_workers=max_workers) as downloads,
+    ):
+
+        def submit(page_id, parent_dir, is_root=False):
+            return executor.submit(
+                process_page,
+                client,
+                writer,
+                converter,
+                page_id,
+                parent_dir,
+                is_root=is_root,
+                downloads=downloads,
+            )
+
+        pending = {submit(root_id, root_dir, is_root=True)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.update(
+                    submit(child_id, child_dir)
+                    for child_id, child_dir in future.result()
+                )
 
 
 class ConfluenceApp:
@@ -91,13 +144,13 @@ class ConfluenceApp:
     def run(self):
         """Execute the export process."""
         page_id = self.client.extract_page_id(self.args.page_url)
-        process_page(
+        process_all(
             self.client,
             self.writer,
             self.converter,
             page_id,
             self.args.output_dir,
-            is_root=True,
+            max_workers=self.args.max_workers,
         )
         logger.info("Download complete.", extra={"caller": __name__})
 
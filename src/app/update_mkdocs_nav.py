@@ -33,26 +33,27 @@ def build_nav_from_dir(dir_path, relative_path=""):
     """
     nav_items = []
     try:
-        entries = sorted(os.listdir(dir_path))
+        with os.scandir(dir_path) as it:
+            entries = sorted(it, key=lambda e: e.name)
     except Exception as e:
         logger.error("Error listing directory %s: %s", dir_path, e)
         return nav_items
 
     for entry in entries:
-        full_path = os.path.join(dir_path, entry)
-        if os.path.isdir(full_path):
-            if entry in EXCLUDED_DIRS:
-                logger.debug("Excluding directory: %s", entry)
-                continue
-            sub_nav = build_nav_from_dir(full_path, os.path.join(relative_path, entry))
+        name = entry.name
+        if name in EXCLUDED_DIRS:
+            logger.debug("Excluding directory: %s", name)
+            continue
+        if entry.is_dir():
+            sub_nav = build_nav_from_dir(entry.path, os.path.join(relative_path, name))
             if sub_nav:
-                nav_items.append({entry: sub_nav})
-        elif os.path.isfile(full_path) and entry.lower().endswith(".md"):
-            if entry.lower() == "index.md":
+                nav_items.append({name: sub_nav})
+        elif name.lower().endswith(".md") and entry.is_file():
+            if name.lower() == "index.md":
                 title = relative_path.split(os.sep)[-1] if relative_path else "Home"
             else:
-                title = os.path.splitext(entry)[0]
-            path_rel = os.path.join(relative_path, entry).replace("\\", "/")
+                title = os.path.splitext(name)[0]
+            path_rel = os.path.join(relative_path, name).replace("\\", "/")
             nav_items.append({title: path_rel})
     return nav_items
 
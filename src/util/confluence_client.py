@@ -5,9 +5,36 @@ and space-only URLs ("/spaces/SPACE" or "/display/SPACE").
 """
 
 import re
+from dataclasses import dataclass
 from urllib.parse import quote, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_RE_PAGES: re.Pattern = re.compile(r"/pages/(\d+)")
+_RE_SPACE_TITLE: re.Pattern = re.compile(r"/(?:display|spaces)/([^/]+)/([^/]+)$")
+_RE_SPACE_ONLY: re.Pattern = re.compile(r"/(?:display|spaces)/([^/]+)/?$")
+
+
+@dataclass(slots=True)
+class Attachment:
+    """
+    An image attached to a Confluence page.
+    """
+
+    filename: str
+    url: str
+
+
+@dataclass(slots=True)
+class PageRef:
+    """
+    A child page listed under a Confluence page.
+    """
+
+    id: str
+    title: str
 
 
 class ConfluenceClient:
@@ -18,6 +45,8 @@ class ConfluenceClient:
     def __init__(self, base_url: str, username: str, token: str) -> None:
         """
         Initialize the ConfluenceClient with a base URL, username, and token.
+        All API calls share one pooled, keep-alive session that retries
+        transient failures.
         """
         self.base_url: str = base_url.rstrip("/")
         parsed = urlparse(self.base_url)
@@ -26,6 +55,20 @@ class ConfluenceClient:
         self.space_api_url: str = f"{self.domain}/rest/api/space"
         self.session: requests.Session = requests.Session()
         self.session.auth = (username, token)
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {"Accept-Encoding": "gzip", "Connection": "keep-alive"}
+        )
 
     def get_page(self, page_id: str) -> dict:
         """
@@ -39,30 +82,62 @@ class ConfluenceClient:
     def get_children(self, page_id: str) -> list:
         """
         Retrieve immediate child pages for a given page.
-        Returns a list of page objects.
+        Returns a list of PageRef records.
         """
         url: str = f"{self.base_api_url}/{page_id}/child/page"
         resp: requests.Response = self.session.get(url)
         resp.raise_for_status()
-        return resp.json().get("results", [])
+        return self._parse_children(resp.json().get("results", []))
 
     def get_images(self, page_id: str) -> list:
         """
         Retrieve images attached to a page.
-        Returns a list of dicts with 'filename' and 'url' keys.
+        Returns a list of Attachment records.
         """
         url: str = f"{self.base_api_url}/{page_id}/child/attachment"
         resp: requests.Response = self.session.get(url)
         resp.raise_for_status()
+        return self._parse_images(resp.json().get("results", []))
+
+    def get_page_full(self, page_id: str) -> tuple:
+        """
+        Retrieve a page together with its child pages and images in a single
+        request, using the REST API's expand feature.
+        Returns a (page, children, images) tuple shaped like the results of
+        get_page, get_children and get_images.
+        """
+        url: str = (
+            f"{self.base_api_url}/{page_id}"
+            f"?expand=body.storage,children.page,children.attachment"
+        )
+        resp: requests.Response = self.session.get(url)
+        resp.raise_for_status()
+        page: dict = resp.json()
+        expanded: dict = page.get("children", {})
+        children: list = expanded.get("page", {}).get("results", [])
+        attachments: list = expanded.get("attachment", {}).get("results", [])
+        return page, self._parse_children(children), self._parse_images(attachments)
+
+    def _parse_children(self, pages: list) -> list:
+        """
+        Reduce child page objects to PageRef records.
+        """
+        return [PageRef(page["id"], page.get("title", "")) for page in pages]
+
+    def _parse_images(self, attachments: list) -> list:
+        """
+        Filter attachment records down to images.
+        Returns a list of Attachment records.
+        """
         images: list = []
-        for att in resp.json().get("results", []):
+        for att in attachments:
             meta: dict = att.get("metadata", {})
             media_type: str = meta.get("mediaType", "")
             if "image" in media_type:
                 fn: str = att["title"]
                 rel: str = att["_links"]["download"]
                 full_url: str = self.domain + rel if rel.startswith("/") else rel
-                images.append({"filename": fn, "url": full_url})
+                images.append(Attachment(fn, full_url))
         return images
 
     def extract_page_id(self, page_url: str) -> str:
@@ -73,19 +148,17 @@ class ConfluenceClient:
         3) Else if it matches '/spaces/SPACE' or '/display/SPACE',
            fetch the default homepage ID for that space.
         """
-        numeric: re.Match = re.search(r"/pages/(\d+)", page_url)
+        numeric: re.Match = _RE_PAGES.search(page_url)
         if numeric:
             return numeric.group(1)
 
-        space_title: re.Match = re.search(
-            r"/(?:display|spaces)/([^/]+)/([^/]+)$", page_url
-        )
+        space_title: re.Match = _RE_SPACE_TITLE.search(page_url)
         if space_title:
             space_key: str = space_title.group(1)
             page_title: str = space_title.group(2)
             return self.get_page_id_by_space_title(space_key, page_title)
 
-        space_only: re.Match = re.search(r"/(?:display|spaces)/([^/]+)/?$", page_url)
+        space_only: re.Match = _RE_SPACE_ONLY.search(page_url)
         if space_only:
             space_key_only: str = space_only.group(1)
             return self.get_space_homepage_id(space_key_only)
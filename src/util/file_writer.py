@@ -3,6 +3,8 @@ Handles writing Markdown and image files.
 """
 
 import os
+import shutil
+from pathlib import Path
 
 import requests
 
@@ -14,11 +16,19 @@ logger = Logger(__name__, level=20, colored=False)
 class FileWriter:
     """Handles file writing and saving assets."""
 
+    def __init__(self):
+        self._dirs: set[str] = set()
+
+    def ensure_dir(self, path):
+        """Create a directory once, skipping paths already created."""
+        if path not in self._dirs:
+            os.makedirs(path, exist_ok=True)
+            self._dirs.add(path)
+
     def save_markdown_file(self, file_path, content):
         """Save Markdown content to a specific file path."""
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "w", encoding="utf-8", errors="ignore") as f:
-            f.write(content)
+        self.ensure_dir(os.path.dirname(file_path))
+        Path(file_path).write_text(content, encoding="utf-8", errors="ignore")
         logger.info("Saved file: %s", file_path)
 
     def save_image(self, output_dir, filename, url, session=None):
@@ -28,8 +38,8 @@ class FileWriter:
         response = session.get(url, stream=True)
         response.raise_for_status()
         file_path = os.path.join(output_dir, "images", filename)
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        self.ensure_dir(os.path.dirname(file_path))
+        response.raw.decode_content = True
         with open(file_path, "wb") as f:
-            for chunk in response.iter_content(1024):
-                f.write(chunk)
+            shutil.copyfileobj(response.raw, f, length=1024 * 1024)
         logger.info("Saved image: %s", file_path)
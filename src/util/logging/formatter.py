@@ -1,6 +1,15 @@
 import logging
 import time
 
+_LEVEL_COLORS = {
+    "DEBUG": "\033[34m",
+    "INFO": "\033[32m",
+    "WARNING": "\033[33m",
+    "ERROR": "\033[31m",
+    "CRITICAL": "\033[1;31m",
+}
+_RESPONSE_SUFFIX = " - [Response: %(api_response_code)s]"
+
 
 class Formatter(logging.Formatter):
     """
@@ -23,27 +32,28 @@ class Formatter(logging.Formatter):
         self.default_fmt = "%(asctime)s - %(levelname)s - %(message)s"
         super().__init__(fmt=self.default_fmt, datefmt="%Y-%m-%dT%H:%M:%SZ", style="%")
         logging.Formatter.converter = time.gmtime
+        self._formatters = {
+            (variant, with_response): logging.Formatter(
+                fmt=fmt + _RESPONSE_SUFFIX if with_response else fmt,
+                datefmt=self.datefmt,
+                style="%",
+            )
+            for variant, fmt in (
+                ("user", self.user_fmt),
+                ("data", self.data_fmt),
+                ("default", self.default_fmt),
+            )
+            for with_response in (False, True)
+        }
 
     def format(self, record: logging.LogRecord) -> str:
         if hasattr(record, "log_type"):
-            fmt = self.user_fmt if record.log_type == "user" else self.data_fmt
+            variant = "user" if record.log_type == "user" else "data"
         else:
-            fmt = self.default_fmt
-        if getattr(record, "api_response_code", None) is not None:
-            fmt += " - [Response: %(api_response_code)s]"
-        self._style._fmt = fmt
+            variant = "default"
+        with_response = getattr(record, "api_response_code", None) is not None
         if self.colored:
-            color = ""
-            if record.levelname == "DEBUG":
-                color = "\033[34m"
-            elif record.levelname == "INFO":
-                color = "\033[32m"
-            elif record.levelname == "WARNING":
-                color = "\033[33m"
-            elif record.levelname == "ERROR":
-                color = "\033[31m"
-            elif record.levelname == "CRITICAL":
-                color = "\033[1;31m"
+            color = _LEVEL_COLORS.get(record.levelname)
             if color:
                 record.levelname = f"{color}{record.levelname}\033[0m"
-        return super().format(record)
+        return self._formatters[variant, with_response].format(record)
@@ -1,10 +1,44 @@
+import atexit
 import logging
 import logging.config
+import queue
 from functools import wraps
-from typing import Any, Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, List, Optional, Tuple
 
 from src.util.logging.formatter import Formatter
 
+_HANDLERS: Dict[Tuple[Optional[str], bool], logging.Handler] = {}
+_LISTENERS: List[QueueListener] = []
+
+
+def _get_handler(logfile: Optional[str], colored: bool) -> logging.Handler:
+    """
+    Return the shared handler for a (logfile, colored) pair, creating it once.
+    File output goes through a queue drained by a background listener thread,
+    so callers never block on disk writes.
+    """
+    key = (logfile, colored)
+    handler = _HANDLERS.get(key)
+    if handler is None:
+        formatter = Formatter(colored=colored)
+        if logfile:
+            file_handler = logging.FileHandler(logfile)
+            file_handler.setFormatter(formatter)
+            log_queue: queue.Queue = queue.Queue(-1)
+            listener = QueueListener(
+                log_queue, file_handler, respect_handler_level=True
+            )
+            listener.start()
+            atexit.register(listener.stop)
+            _LISTENERS.append(listener)
+            handler = QueueHandler(log_queue)
+        else:
+            handler = logging.StreamHandler()
+            handler.setFormatter(formatter)
+        _HANDLERS[key] = handler
+    return handler
+
 
 class Logger(logging.Logger):
     """
@@ -20,11 +54,7 @@ class Logger(logging.Logger):
         colored: bool = False,
     ):
         super().__init__(name, level)
-        self.handlers.clear()
-        formatter = Formatter(colored=colored)
-        handler = logging.FileHandler(logfile) if logfile else logging.StreamHandler()
-        handler.setFormatter(formatter)
-        self.addHandler(handler)
+        self.addHandler(_get_handler(logfile, colored))
 
     def log_user(
         self,
@@ -39,6 +69,8 @@ class Logger(logging.Logger):
         api_response_code: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
+        if not self.isEnabledFor(level):
+            return
         extra = {
             "log_type": "user",
             "transaction_id": transaction_id,
@@ -62,6 +94,8 @@ class Logger(logging.Logger):
         api_response_code: Optional[int] = None,
         **kwargs: Any,
     ) -> None:
+        if not self.isEnabledFor(level):
+            return
         extra = {
             "log_type": "data",
             "data_id": data_id,
@@ -77,13 +111,15 @@ def log_exceptions(logger: Logger):
     """Decorator to log exceptions from the decorated function."""
 
     def decorator(func):
+        caller = f"{func.__module__}.{func.__qualname__}"
+        extra = {"caller": caller}
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                caller = f"{func.__module__}.{func.__qualname__}"
-                logger.error(f"Exception in {caller}: {e}", extra={"caller": caller})
+                logger.exception("Exception in %s: %s", caller, e, extra=extra)
                 raise
 
         return wrapper
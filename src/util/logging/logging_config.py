@@ -1,4 +1,4 @@
-import logging
+import logging.config
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -38,6 +38,12 @@ LOGGING_CONFIG = {
 }
 
 
+_CONFIGURED = False
+
+
 def setup_logging() -> None:
-    """Applies the dictionary-based logging config."""
-    logging.config.dictConfig(LOGGING_CONFIG)
+    """Applies the dictionary-based logging config once per process."""
+    global _CONFIGURED
+    if not _CONFIGURED:
+        logging.config.dictConfig(LOGGING_CONFIG)
+        _CONFIGURED = True
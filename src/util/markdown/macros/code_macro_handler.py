@@ -1,12 +1,18 @@
 import re
 from typing import Optional
 
+_CDATA_RE: re.Pattern = re.compile(r"^<!\[CDATA\[(.*)\]\]>$", re.DOTALL)
+_BODY_START_RE: re.Pattern = re.compile(r"<ac:plain-text-body\b[^>]*>", re.IGNORECASE)
+_BODY_END_RE: re.Pattern = re.compile(r"</ac:plain-text-body\s*>", re.IGNORECASE)
+
 
 class CodeMacroHandler:
     """
     Manages extraction of code macro content.
     """
 
+    __slots__ = ("in_code_macro", "in_code_body", "start_offset")
+
     def __init__(self) -> None:
         """
         Prepare to track code macro state.
@@ -36,22 +42,22 @@ class CodeMacroHandler:
 
     def finalize(self, raw_html: str, offset: int) -> str:
         """
-        Collect the snippet from the start offset to the current offset,
+        Search raw_html between the start offset and the current offset,
         parse out the text within <ac:plain-text-body>, decode CDATA if present,
         return a fenced code block.
         """
-        snippet: str = ""
-        if self.start_offset is not None:
-            snippet = raw_html[self.start_offset : offset]
-        begin: int = snippet.lower().find("<ac:plain-text-body>")
         text: str = ""
-        if begin != -1:
-            end: int = snippet.lower().find("</ac:plain-text-body>", begin)
-            if end != -1:
-                after: int = snippet.find(">", begin) + 1
-                text = snippet[after:end].strip()
-        cdata_pat: re.Pattern = re.compile(r"^<!\[CDATA\[(.*)\]\]>$", re.DOTALL)
-        match: Optional[re.Match] = cdata_pat.match(text)
+        if self.start_offset is not None:
+            begin: Optional[re.Match] = _BODY_START_RE.search(
+                raw_html, self.start_offset, offset
+            )
+            if begin:
+                end: Optional[re.Match] = _BODY_END_RE.search(
+                    raw_html, begin.end(), offset
+                )
+                if end:
+                    text = raw_html[begin.end() : end.start()].strip()
+        match: Optional[re.Match] = _CDATA_RE.match(text)
         if match:
             text = match.group(1).lstrip("\n\r").rstrip()
         block: str = "\n```plaintext\n" + text + "\n```\n"
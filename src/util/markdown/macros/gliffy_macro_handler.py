@@ -3,12 +3,19 @@ from typing import Optional
 
 from src.util.utils import sanitize_title
 
+_GLIFFY_NAME_RE: re.Pattern = re.compile(
+    r'<ac:parameter\s+ac:name="name">\s*([^<]+)\s*</ac:parameter>',
+    flags=re.IGNORECASE,
+)
+
 
 class GliffyMacroHandler:
     """
     Manages extraction of Gliffy macro content.
     """
 
+    __slots__ = ("in_gliffy", "start_offset")
+
     def __init__(self) -> None:
         """
         Prepare to track gliffy macro state.
@@ -25,17 +32,12 @@ class GliffyMacroHandler:
 
     def finalize(self, raw_html: str, offset: int) -> str:
         """
-        Collect the snippet from start to offset,
+        Search raw_html between start and offset,
         parse the diagram name out of <ac:parameter ac:name="name">, or use fallback.
         """
-        snippet: str = ""
+        found: Optional[re.Match] = None
         if self.start_offset is not None:
-            snippet = raw_html[self.start_offset : offset]
-        pat: re.Pattern = re.compile(
-            r'<ac:parameter\s+ac:name="name">\s*([^<]+)\s*</ac:parameter>',
-            flags=re.IGNORECASE,
-        )
-        found: Optional[re.Match] = pat.search(snippet)
+            found = _GLIFFY_NAME_RE.search(raw_html, self.start_offset, offset)
         diag: str = found.group(1).strip() if found else "gliffy_diagram"
         sanitized: str = sanitize_title(diag)
         ref: str = f"\n![{diag}](images/{sanitized}.png)\n"
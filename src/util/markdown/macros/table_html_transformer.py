@@ -4,10 +4,19 @@ Module: table_html_transformer.py
 Transforms raw table HTML to convert Confluence tasks into HTML checkboxes.
 """
 
+import io
 import re
 from html.parser import HTMLParser
 from typing import Dict, List, Optional, Tuple
 
+from src.util.utils import strip_task_prefix
+
+_TASK_ID_RE: re.Pattern = re.compile(r"^[0-9]+(\.|\)|\s|$)")
+_TASK_ID_STATUS_RE: re.Pattern = re.compile(
+    r"^[0-9]+(\.|\)|\s)*(complete|incomplete)?$"
+)
+_TAGS_WITH_ATTRS: frozenset = frozenset({"span", "ac:task"})
+
 
 def transform_table_html(table_html: str) -> str:
     """Transform table HTML to replace Confluence tasks with checkboxes."""
@@ -22,7 +31,7 @@ class TableHtmlTransformer(HTMLParser):
     def __init__(self) -> None:
         """Initialize the TableHtmlTransformer."""
         super().__init__()
-        self.output: List[str] = []
+        self.output: io.StringIO = io.StringIO()
         self.in_task_list: bool = False
         self.in_ac_task: bool = False
         self.in_task_body: bool = False
@@ -32,24 +41,26 @@ class TableHtmlTransformer(HTMLParser):
 
     def get_output(self) -> str:
         """Return the transformed HTML output."""
-        return "".join(self.output)
+        return self.output.getvalue()
 
     def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
         """Handle the start of an HTML tag."""
         tag_lower: str = tag.lower()
-        attr_dict: Dict[str, str] = {k.lower(): v for k, v in attrs if v is not None}
         if tag_lower == "ac:task-id":
             return
-        if tag_lower == "span" and "class" in attr_dict:
-            if attr_dict["class"] == "placeholder-inline-tasks":
+        if tag_lower in _TAGS_WITH_ATTRS:
+            attr_dict: Dict[str, str] = {
+                k.lower(): v for k, v in attrs if v is not None
+            }
+            if tag_lower == "ac:task":
+                self.in_ac_task = True
+                self.task_status = attr_dict.get("ac:task-status", "incomplete").lower()
+                return
+            if attr_dict.get("class") == "placeholder-inline-tasks":
                 return
         if tag_lower == "ac:task-list":
             self.in_task_list = True
-            self.output.append("<ul>")
-            return
-        if tag_lower == "ac:task":
-            self.in_ac_task = True
-            self.task_status = attr_dict.get("ac:task-status", "incomplete")
+            self.output.write("<ul>")
             return
         if tag_lower == "ac:task-body":
             self.in_task_body = True
@@ -57,26 +68,19 @@ class TableHtmlTransformer(HTMLParser):
         if tag_lower == "ac:task-status":
             self.in_ac_task_status = True
             return
-        self._append_raw_tag(tag_lower, attr_dict, is_start=True)
+        self._append_raw_tag(tag_lower, attrs, is_start=True)
 
     def handle_endtag(self, tag: str) -> None:
         """Handle the end of an HTML tag."""
         tag_lower: str = tag.lower()
         if tag_lower == "ac:task-list":
             self.in_task_list = False
-            self.output.append("</ul>")
+            self.output.write("</ul>")
             return
         if tag_lower == "ac:task":
-            text: str = "".join(self.task_body_buffer).strip()
-
-            text = re.sub(
-                r"^[0-9\.\)\(\-_\s]*(complete|incomplete)?\s*",
-                "",
-                text,
-                flags=re.IGNORECASE,
-            )
-            checked: str = "checked" if self.task_status.lower() == "complete" else ""
-            self.output.append(f"<li><input type='checkbox' {checked}> {text}</li>")
+            text: str = strip_task_prefix("".join(self.task_body_buffer).strip())
+            checked: str = "checked" if self.task_status == "complete" else ""
+            self.output.write(f"<li><input type='checkbox' {checked}> {text}</li>")
             self.task_body_buffer = []
             self.in_ac_task = False
             return
@@ -90,7 +94,7 @@ class TableHtmlTransformer(HTMLParser):
             return
         if tag_lower == "span":
             return
-        self._append_raw_tag(tag_lower, {}, is_start=False)
+        self._append_raw_tag(tag_lower, [], is_start=False)
 
     def handle_data(self, data: str) -> None:
         """Handle data within tags."""
@@ -99,22 +103,22 @@ class TableHtmlTransformer(HTMLParser):
             return
         if self.in_ac_task and not self.in_task_body and not self.in_ac_task_status:
             check_data: str = data.strip().lower()
-            if re.match(r"^[0-9]+(\.|\)|\s|$)", check_data) or re.match(
-                r"^[0-9]+(\.|\)|\s)*(complete|incomplete)?$", check_data
-            ):
+            if _TASK_ID_RE.match(check_data) or _TASK_ID_STATUS_RE.match(check_data):
                 return
         if self.in_task_body:
             self.task_body_buffer.append(data)
         else:
-            self.output.append(data)
+            self.output.write(data)
 
-    def _append_raw_tag(self, tag: str, attrs: Dict[str, str], is_start: bool) -> None:
+    def _append_raw_tag(
+        self, tag: str, attrs: List[Tuple[str, Optional[str]]], is_start: bool
+    ) -> None:
         """Append a raw HTML tag to the output."""
         if is_start:
-            attr_str: str = " ".join(f'{k}="{v}"' for k, v in attrs.items())
+            attr_str: str = " ".join(f'{k}="{v}"' for k, v in attrs if v is not None)
             if attr_str:
-                self.output.append(f"<{tag} {attr_str}>")
+                self.output.write(f"<{tag} {attr_str}>")
             else:
-                self.output.append(f"<{tag}>")
+                self.output.write(f"<{tag}>")
         else:
-            self.output.append(f"</{tag}>")
+            self.output.write(f"</{tag}>")
@@ -22,7 +22,8 @@ class MarkdownConverter:
 
     def convert(self, html_content: str) -> str:
         logger.info("Starting custom Markdown conversion.")
-        logger.debug("Raw HTML snippet (first 500 chars): %s", html_content[:500])
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Raw HTML snippet (first 500 chars): %s", html_content[:500])
         parser = MarkdownParser(self.client)
         parser.feed(html_content)
         markdown = parser.get_markdown()
@@ -8,16 +8,52 @@ extracts content from Confluence code macros into fenced code blocks, and
 derives the actual image filename for Gliffy diagrams from parameters.
 """
 
+import io
 import re
+from collections import Counter
 from html.parser import HTMLParser
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from src.util.markdown.macros.code_macro_handler import CodeMacroHandler
 from src.util.markdown.macros.gliffy_macro_handler import GliffyMacroHandler
-from src.util.markdown.macros.table_html_transformer import \
-    transform_table_html
+from src.util.markdown.macros.table_html_transformer import TableHtmlTransformer
 from src.util.markdown.parser_config import TAG_HANDLERS
-from src.util.utils import decode_literal_unicode_escapes, sanitize_title
+from src.util.utils import (decode_literal_unicode_escapes, sanitize_title,
+                            strip_task_prefix)
+
+_HEADING_RE: re.Pattern = re.compile(r"^(#+\s+.*)$", re.MULTILINE)
+_IMG_START_RE: re.Pattern = re.compile(r"(?<!\n)(!\[)")
+_IMG_BREAK_RE: re.Pattern = re.compile(
+    r"(?P<img_start>(?<!\n)!\[)|(?P<img_end>\]\(images/[^)]+\))"
+)
+_SRC_PREFIX_RE: re.Pattern = re.compile(r"^src:\s*", re.MULTILINE)
+_URL_RE: re.Pattern = re.compile(r"(https?://\S+)")
+_TRAILING_WS_RE: re.Pattern = re.compile(r"[^\S\n]+$", re.MULTILINE)
+_INLINE_TAGS: frozenset = frozenset({"strong", "b", "em", "i", "u", "del", "strike"})
+
+
+class _AttrView:
+    """
+    Read-only view over HTMLParser's attribute list, giving handlers
+    dict-style get() without building a dict for every tag.
+    """
+
+    __slots__ = ("_attrs",)
+
+    def __init__(self, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._attrs = attrs
+
+    def get(self, key: str, default: str = "") -> str:
+        """
+        Return the value of the last attribute named key, or default.
+        """
+        for k, v in reversed(self._attrs):
+            if k == key:
+                return default if v is None else v
+        return default
+
+
+_EMPTY_ATTRS: _AttrView = _AttrView([])
 
 
 class MarkdownParser(HTMLParser):
@@ -32,9 +68,10 @@ class MarkdownParser(HTMLParser):
         """
         super().__init__()
         self.client: Any = client
-        self.output: List[str] = []
-        self.tag_stack: List[str] = []
-        self.config: Dict[str, str] = TAG_HANDLERS.copy()
+        self.output: io.StringIO = io.StringIO()
+        self.tag_counts: Counter = Counter()
+        self._inline_depth: int = 0
+        self.config: Dict[str, str] = TAG_HANDLERS
         self.in_code_block: bool = False
         self.list_stack: List[Tuple[str, int]] = []
         self.in_list_item: bool = False
@@ -44,16 +81,51 @@ class MarkdownParser(HTMLParser):
         self.task_body_buffer: List[str] = []
         self.in_table_mode: bool = False
         self.table_depth: int = 0
-        self.table_html: List[str] = []
+        self.table_transformer: Optional[TableHtmlTransformer] = None
+        self._abs_offset: int = 0
 
         self.code_macro: CodeMacroHandler = CodeMacroHandler()
         self.gliffy_macro: GliffyMacroHandler = GliffyMacroHandler()
 
+        (
+            self._start_dispatch,
+            self._end_dispatch,
+            self._self_dispatch,
+        ) = self._dispatch_tables()
+
+    @classmethod
+    def _dispatch_tables(
+        cls,
+    ) -> Tuple[Dict[str, Callable], Dict[str, Callable], Dict[str, Callable]]:
+        """
+        Return the start, end and self-closing handler tables for this class.
+        Handler names from TAG_HANDLERS are resolved once per class; the
+        tables hold plain functions that are called with the parser instance.
+        """
+        tables = cls.__dict__.get("_DISPATCH_TABLES")
+        if tables is None:
+            tables = (
+                {
+                    tag: getattr(cls, name, cls.default_start_handler)
+                    for tag, name in TAG_HANDLERS.items()
+                },
+                {
+                    tag: getattr(cls, name + "_end", cls.default_end_handler)
+                    for tag, name in TAG_HANDLERS.items()
+                },
+                {
+                    tag: getattr(cls, name, cls.default_self_handler)
+                    for tag, name in TAG_HANDLERS.items()
+                },
+            )
+            cls._DISPATCH_TABLES = tables
+        return tables
+
     def get_markdown(self) -> str:
         """
         Return the processed Markdown text.
         """
-        joined: str = "".join(self.output)
+        joined: str = self.output.getvalue()
         return self._post_process_output(joined)
 
     def _post_process_output(self, text_in: str) -> str:
@@ -64,18 +136,21 @@ class MarkdownParser(HTMLParser):
         def clean_heading(match: re.Match) -> str:
             return match.group(0).replace("**", "")
 
-        def transform_links(txt: str) -> str:
-            pat: re.Pattern = re.compile(r"(https?://\S+)")
-            return pat.sub(r"[Click Me ️👆](\1#code)", txt)
+        def break_image(match: re.Match) -> str:
+            token: str = match.group(0)
+            if match.lastgroup == "img_start":
+                return "\n" + token
+            return _IMG_START_RE.sub(r"\n\1", token) + "\n"
 
-        text: str = re.sub(
-            r"^(#+\s+.*)$", lambda m: clean_heading(m), text_in, flags=re.MULTILINE
-        )
-        text = re.sub(r"(?<!\n)(!\[)", r"\n\1", text)
-        text = re.sub(r"(\]\(images/[^)]+\))", r"\1\n", text)
-        text = re.sub(r"^src:\s*", "", text, flags=re.MULTILINE)
-        lines: List[str] = [ln.rstrip() for ln in text.splitlines()]
-        final: str = "\n".join(lines)
+        def transform_links(txt: str) -> str:
+            return _URL_RE.sub(r"[Click Me ️👆](\1#code)", txt)
+
+        text: str = _HEADING_RE.sub(clean_heading, text_in)
+        text = _IMG_BREAK_RE.sub(break_image, text)
+        text = _SRC_PREFIX_RE.sub("", text)
+        final: str = _TRAILING_WS_RE.sub("", text)
+        if text.endswith("\n"):
+            final = final[:-1]
         final = decode_literal_unicode_escapes(final)
         final = transform_links(final)
         return final
@@ -89,24 +164,27 @@ class MarkdownParser(HTMLParser):
             self._append_table_html(self.get_starttag_text())
             if t == "table":
                 self.table_depth += 1
-            self.tag_stack.append(t)
+            self._push_tag(t)
             return
 
-        self.tag_stack.append(t)
+        self._push_tag(t)
+        view: _AttrView = _AttrView(attrs)
         if t == "ac:structured-macro":
-            mapped: Dict[str, str] = {k: v for k, v in attrs if v}
-            name: str = mapped.get("ac:name", "").lower()
+            name: str = view.get("ac:name").lower()
             if name == "code":
                 self.code_macro.begin_code_macro(self._raw_offset())
             if name == "gliffy":
                 self.gliffy_macro.begin_gliffy(self._raw_offset())
 
-        if self.code_macro.in_code_macro and t == "ac:plain-text-body":
-            self.code_macro.begin_code_body()
+        code_macro: CodeMacroHandler = self.code_macro
+        if code_macro.in_code_macro and t == "ac:plain-text-body":
+            code_macro.begin_code_body()
 
-        method_n: str = self.config.get(t, "default_start_handler")
-        method = getattr(self, method_n, self.default_start_handler)
-        method(t, dict(attrs))
+        method: Optional[Callable] = self._start_dispatch.get(t)
+        if method is not None:
+            method(self, t, view)
+        else:
+            self.default_start_handler(t, _EMPTY_ATTRS)
         if t == "table":
             self._start_table_mode(self.get_starttag_text())
 
@@ -121,29 +199,29 @@ class MarkdownParser(HTMLParser):
                 self.table_depth -= 1
                 if self.table_depth == 0:
                     self._end_table_mode()
-            if t in self.tag_stack:
-                self.tag_stack.remove(t)
+            self._pop_tag(t)
             return
 
-        if t in self.tag_stack:
-            self.tag_stack.remove(t)
+        self._pop_tag(t)
 
-        if self.code_macro.in_code_macro and t == "ac:plain-text-body":
-            self.code_macro.end_code_body()
+        code_macro: CodeMacroHandler = self.code_macro
+        if code_macro.in_code_macro:
+            if t == "ac:plain-text-body":
+                code_macro.end_code_body()
+            elif t == "ac:structured-macro":
+                final: str = code_macro.finalize(self.rawdata, self._raw_offset())
+                self.output.write(final)
 
-        if self.code_macro.in_code_macro and t == "ac:structured-macro":
-            final: str = self.code_macro.finalize(self.rawdata, self._raw_offset())
-            self.output.append(final)
-
-        if self.gliffy_macro.in_gliffy and t == "ac:structured-macro":
-            gliffy_block: str = self.gliffy_macro.finalize(
-                self.rawdata, self._raw_offset()
-            )
-            self.output.append(gliffy_block)
+        gliffy_macro: GliffyMacroHandler = self.gliffy_macro
+        if gliffy_macro.in_gliffy and t == "ac:structured-macro":
+            gliffy_block: str = gliffy_macro.finalize(self.rawdata, self._raw_offset())
+            self.output.write(gliffy_block)
 
-        method_n: str = self.config.get(t, "default_end_handler") + "_end"
-        method = getattr(self, method_n, self.default_end_handler)
-        method(t)
+        method: Optional[Callable] = self._end_dispatch.get(t)
+        if method is not None:
+            method(self, t)
+        else:
+            self.default_end_handler(t)
 
     def handle_startendtag(
         self, tag: str, attrs: List[Tuple[str, Optional[str]]]
@@ -155,16 +233,19 @@ class MarkdownParser(HTMLParser):
         if self.in_table_mode:
             self._append_table_html(self.get_starttag_text())
             return
-        method_n: str = self.config.get(t, "default_self_handler")
-        method = getattr(self, method_n, self.default_self_handler)
-        method(t, dict(attrs))
+        method: Optional[Callable] = self._self_dispatch.get(t)
+        if method is not None:
+            method(self, t, _AttrView(attrs))
+        else:
+            self.default_self_handler(t, _EMPTY_ATTRS)
 
     def handle_data(self, data: str) -> None:
         """
         Handle textual data in the HTML, skipping data
         inside code/gliffy macros to avoid leftover IDs.
         """
-        if self.code_macro.in_code_macro and not self.code_macro.in_code_body:
+        code_macro: CodeMacroHandler = self.code_macro
+        if code_macro.in_code_macro and not code_macro.in_code_body:
             return
         if self.gliffy_macro.in_gliffy:
             return
@@ -175,7 +256,7 @@ class MarkdownParser(HTMLParser):
             if c:
                 self._append_text(c)
 
-    def default_start_handler(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def default_start_handler(self, tag: str, attrs: _AttrView) -> None:
         """
         Default handler for start tags.
         """
@@ -187,7 +268,7 @@ class MarkdownParser(HTMLParser):
         """
         pass
 
-    def default_self_handler(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def default_self_handler(self, tag: str, attrs: _AttrView) -> None:
         """
         Default handler for self-closing tags.
         """
@@ -195,61 +276,87 @@ class MarkdownParser(HTMLParser):
 
     def _start_table_mode(self, raw_tag: str) -> None:
         """
-        Enter table mode to capture raw table HTML.
+        Enter table mode and start streaming raw table HTML to a transformer.
         """
         self.in_table_mode = True
         self.table_depth = 1
-        self.table_html = []
+        self.table_transformer = TableHtmlTransformer()
         self._append_table_html(raw_tag)
 
     def _end_table_mode(self) -> None:
         """
-        Exit table mode and process the table HTML.
+        Exit table mode and emit the transformed table HTML.
         """
         self.in_table_mode = False
-        joined: str = "".join(self.table_html)
-        final: str = transform_table_html(joined)
-        self.output.append("\n" + final + "\n")
-        self.table_html = []
+        transformer: TableHtmlTransformer = self.table_transformer
+        transformer.close()
+        self.output.write("\n" + transformer.get_output() + "\n")
+        self.table_transformer = None
 
     def _append_table_html(self, content: str) -> None:
         """
-        Append content to the table HTML buffer.
+        Feed table HTML to the active table transformer.
         """
-        self.table_html.append(content)
+        self.table_transformer.feed(content)
 
     def _append_text(self, text: str) -> None:
         """
         Append text to the output, handling inline formatting.
         """
-        if self._in_inline_formatting():
+        if self._inline_depth:
             text = text.rstrip()
         if self.in_list_item:
             self.list_item_buffer.append(text)
         elif self.in_task_body:
             self.task_body_buffer.append(text)
         else:
-            self.output.append(text)
+            self.output.write(text)
+
+    def _push_tag(self, tag: str) -> None:
+        """
+        Record an opened tag, counting inline formatting tags.
+        """
+        self.tag_counts[tag] += 1
+        if tag in _INLINE_TAGS:
+            self._inline_depth += 1
 
-    def _in_inline_formatting(self) -> bool:
+    def _pop_tag(self, tag: str) -> None:
         """
-        Return whether currently in inline formatting tags.
+        Forget an opened tag when it closes, if it was recorded.
         """
-        inline: set = {"strong", "b", "em", "i", "u", "del", "strike"}
-        return any(tag in self.tag_stack for tag in inline)
+        if self.tag_counts[tag]:
+            self.tag_counts[tag] -= 1
+            if tag in _INLINE_TAGS:
+                self._inline_depth -= 1
+
+    def feed(self, data: str) -> None:
+        """
+        Feed data to the parser; offsets restart with each parsing pass.
+        """
+        self._abs_offset = 0
+        super().feed(data)
+
+    def close(self) -> None:
+        """
+        Flush any buffered data through the parser.
+        """
+        self._abs_offset = 0
+        super().close()
+
+    def updatepos(self, i: int, j: int) -> int:
+        """
+        Track the absolute offset in self.rawdata alongside the line position.
+        """
+        self._abs_offset = j
+        return super().updatepos(i, j)
 
     def _raw_offset(self) -> int:
         """
         Return the absolute offset in self.rawdata from current parser position.
         """
-        line, col = self.getpos()
-        splitted: List[str] = self.rawdata.splitlines(True)
-        if line - 1 < len(splitted):
-            before: int = sum(len(ln) for ln in splitted[: line - 1])
-            return before + col
-        return len(self.rawdata)
+        return self._abs_offset
 
-    def handle_heading(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_heading(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle heading tags.
         """
@@ -260,13 +367,13 @@ class MarkdownParser(HTMLParser):
             lv = 1
         self._append_text("\n" + "#" * lv + " ")
 
-    def handle_paragraph(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_paragraph(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle paragraph tags.
         """
         self._append_text("\n\n")
 
-    def handle_ul(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_ul(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle unordered list start.
         """
@@ -280,7 +387,7 @@ class MarkdownParser(HTMLParser):
         if self.list_stack:
             self.list_stack.pop()
 
-    def handle_ol(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_ol(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle ordered list start.
         """
@@ -294,7 +401,7 @@ class MarkdownParser(HTMLParser):
         if self.list_stack:
             self.list_stack.pop()
 
-    def handle_li(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_li(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle list item start.
         """
@@ -315,9 +422,9 @@ class MarkdownParser(HTMLParser):
                 prefix = f"{count}. "
                 self.list_stack[-1] = (typ, count + 1)
         content: str = "".join(self.list_item_buffer).strip()
-        self.output.append(f"\n{prefix}{content}")
+        self.output.write(f"\n{prefix}{content}")
 
-    def handle_code(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_code(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle inline code start.
         """
@@ -329,7 +436,7 @@ class MarkdownParser(HTMLParser):
         """
         self._append_text("` ")
 
-    def handle_pre(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_pre(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle code block start.
         """
@@ -343,7 +450,7 @@ class MarkdownParser(HTMLParser):
         self.in_code_block = False
         self._append_text("\n```\n")
 
-    def handle_strong(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_strong(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle strong text start.
         """
@@ -355,7 +462,7 @@ class MarkdownParser(HTMLParser):
         """
         self._append_text("** ")
 
-    def handle_em(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_em(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle emphasized text start.
         """
@@ -367,7 +474,7 @@ class MarkdownParser(HTMLParser):
         """
         self._append_text("_ ")
 
-    def handle_u(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_u(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle underline text start.
         """
@@ -379,7 +486,7 @@ class MarkdownParser(HTMLParser):
         """
         self._append_text("</u> ")
 
-    def handle_del(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_del(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle deleted text start.
         """
@@ -391,7 +498,7 @@ class MarkdownParser(HTMLParser):
         """
         self._append_text("~~ ")
 
-    def handle_ac_emoticon(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_ac_emoticon(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle Confluence emoticon tags.
         """
@@ -408,7 +515,7 @@ class MarkdownParser(HTMLParser):
         """
         pass
 
-    def handle_ac_task_list(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_ac_task_list(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle task list start.
         """
@@ -420,7 +527,7 @@ class MarkdownParser(HTMLParser):
         """
         self._append_text("\n")
 
-    def handle_ac_task(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_ac_task(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle task start.
         """
@@ -434,15 +541,13 @@ class MarkdownParser(HTMLParser):
         """
         cbox: str = "[x]" if self.task_status == "complete" else "[ ]"
         combined: str = "".join(self.task_body_buffer).strip()
-        final: str = re.sub(
-            r"^[0-9]+\s*(complete|incomplete)\s*", "", combined, flags=re.IGNORECASE
-        )
-        self.output.append(f"\n- {cbox} {final}")
+        final: str = strip_task_prefix(combined)
+        self.output.write(f"\n- {cbox} {final}")
         self.in_task_body = False
         self.task_body_buffer = []
         self.task_status = None
 
-    def handle_ac_task_body(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_ac_task_body(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle task body start.
         """
@@ -454,7 +559,7 @@ class MarkdownParser(HTMLParser):
         """
         self.in_task_body = False
 
-    def handle_img(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_img(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle image tags.
         """
@@ -462,7 +567,7 @@ class MarkdownParser(HTMLParser):
         s: str = sanitize_title(alt)
         self._append_text(f"\n![{s}](images/{s})\n")
 
-    def handle_ac_image(self, tag: str, attrs: Dict[str, Optional[str]]) -> None:
+    def handle_ac_image(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle ac:image tags.
         """
@@ -474,9 +579,7 @@ class MarkdownParser(HTMLParser):
         s: str = sanitize_title(alt)
         self._append_text(f"\n![{s}](images/{s})\n")
 
-    def handle_ac_structured_macro(
-        self, tag: str, attrs: Dict[str, Optional[str]]
-    ) -> None:
+    def handle_ac_structured_macro(self, tag: str, attrs: _AttrView) -> None:
         """
         Handle structured macros. Code and gliffy macros are processed
         in handle_endtag. All others produce a single space.
@@ -484,14 +587,3 @@ class MarkdownParser(HTMLParser):
         mac: str = attrs.get("ac:name", "").lower()
         if mac not in ("code", "gliffy"):
             self._append_text(" ")
-
-    def _getpos_in_rawdata(self) -> int:
-        """
-        Return the absolute offset in rawdata based on current parser position.
-        """
-        line, col = self.getpos()
-        splitted: List[str] = self.rawdata.splitlines(True)
-        if line - 1 < len(splitted):
-            before: int = sum(len(ln) for ln in splitted[: line - 1])
-            return before + col
-        return len(self.rawdata)
@@ -2,49 +2,105 @@
 Utility functions.
 """
 
+import codecs
 import re
+from functools import lru_cache
+from typing import List, Optional
 
+_TASK_PREFIX_CHARS: frozenset = frozenset("0123456789.)(-_")
+_TITLE_SEPARATOR_TABLE: bytes = bytes.maketrans(b"/\\", b"--")
+_TITLE_STRIP_CHARS: bytes = b'<>:"|?*'
+_TITLE_STRIP_RE: re.Pattern = re.compile(r'[<>:"|?*]')
+_BLOB_IMG_RE: re.Pattern = re.compile(r"!\[([^\]]{0,512})\]\(blob:[^)]+\)")
+_UNICODE_ESC_RE: re.Pattern = re.compile(r"(?:\\u[0-9A-Fa-f]{4}|\\U[0-9A-Fa-f]{8})++")
+_UNICODE_ESC_DECODE = codecs.getdecoder("unicode_escape")
 
+
+@lru_cache(maxsize=4096)
 def sanitize_title(title):
     """
     Convert a page title into a safe filename
     while keeping recognizable characters.
+    Results are memoized, as the same titles and attachment names recur
+    across an export.
     """
     title = title.strip()
+    if title.isascii():
+        return (
+            title.encode("ascii")
+            .translate(_TITLE_SEPARATOR_TABLE, _TITLE_STRIP_CHARS)
+            .decode("ascii")
+        )
     title = title.replace("/", "-").replace("\\", "-")
-    return re.sub(r'[<>:"|?*]', "", title)
+    return _TITLE_STRIP_RE.sub("", title)
 
 
 def replace_blob_image_refs(markdown, images):
     """
     Replace markdown image references with blob URLs with local references.
 
-    For each image in images, if a markdown image reference contains a blob:
-    URL and its alt text (or part of it) matches the image filename, replace the
-    URL with "images/<filename>".
+    For each Attachment (or plain filename) in images, if a markdown image
+    reference contains a blob: URL and its alt text (or part of it) matches
+    the image filename, replace the URL with "images/<filename>". When
+    several filenames match, the first one in images wins.
     """
-    for img in images:
-        pattern = re.compile(
-            r"(!\[[^\]]*" + re.escape(img["filename"]) + r"[^\]]*\]\()blob:[^)]+\)"
-        )
-        markdown = pattern.sub(r"\1images/" + img["filename"] + ")", markdown)
-    return markdown
+    if "blob:" not in markdown:
+        return markdown
+    names = list(
+        dict.fromkeys(img if isinstance(img, str) else img.filename for img in images)
+    )
+    if not names:
+        return markdown
+
+    resolved = {}
+
+    def replace(match):
+        alt = match.group(1)
+        if alt in resolved:
+            name = resolved[alt]
+        else:
+            name = next((n for n in names if n in alt), None)
+            resolved[alt] = name
+        if name is None:
+            return match.group(0)
+        return "![" + alt + "](images/" + name + ")"
+
+    return _BLOB_IMG_RE.sub(replace, markdown)
+
+
+def strip_task_prefix(text: str) -> str:
+    """
+    Strip the task id and status text that Confluence task markup leaves in
+    front of a task's body, e.g. "12 incomplete Buy milk" -> "Buy milk".
+    """
+    i: int = 0
+    n: int = len(text)
+    while i < n and (text[i] in _TASK_PREFIX_CHARS or text[i].isspace()):
+        i += 1
+    head: str = text[i : i + 10].lower()
+    if head.startswith("incomplete"):
+        i += 10
+    elif head.startswith("complete"):
+        i += 8
+    return text[i:].lstrip()
 
 
 def decode_literal_unicode_escapes(text: str) -> str:
     """
     Decode literal backslash-escaped Unicode sequences like \\uXXXX or
     \\UXXXXXXXX, preserving normal emoji codepoints and other characters.
+    Out-of-range code points are dropped.
     """
-    pattern: re.Pattern = re.compile(r"(\\u[0-9A-Fa-f]{4}|\\U[0-9A-Fa-f]{8})+")
-
-    def decode_match(match: re.Match) -> str:
-        raw: str = match.group(0)
-        try:
-            return raw.encode("ascii", errors="ignore").decode(
-                "unicode_escape", errors="ignore"
-            )
-        except UnicodeDecodeError:
-            return raw
-
-    return pattern.sub(decode_match, text)
+    if "\\u" not in text and "\\U" not in text:
+        return text
+    first: Optional[re.Match] = _UNICODE_ESC_RE.search(text)
+    if first is None:
+        return text
+    parts: List[str] = []
+    last: int = 0
+    for match in _UNICODE_ESC_RE.finditer(text, first.start()):
+        parts.append(text[last : match.start()])
+        parts.append(_UNICODE_ESC_DECODE(match.group(0).encode("latin-1"), "ignore")[0])
+        last = match.end()
+    parts.append(text[last:])
+    return "".join(parts)